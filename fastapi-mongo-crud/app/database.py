@@ -1,5 +1,5 @@
 # app/database.py
-import motor.motor_asyncio
+from pymongo import AsyncMongoClient, UpdateOne
 from pymongo.errors import CollectionInvalid
 import logging
 
@@ -7,7 +7,25 @@ import logging
 # O nome do host "mongo" é o nome do serviço definido no docker-compose.yml
 MONGO_DETAILS = "mongodb://mongo:27017"
 
-client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_DETAILS)
+# O cliente assíncrono nativo do PyMongo dispensa a ponte de threads usada pelo Motor.
+# O pool mantém conexões abertas entre picos de requisições, evitando refazer o
+# handshake TCP a cada rajada, e o `zstd` comprime o tráfego BSON com o servidor.
+client = AsyncMongoClient(
+    MONGO_DETAILS,
+    minPoolSize=50,
+    maxPoolSize=200,
+    maxIdleTimeMS=60000,
+    serverSelectionTimeoutMS=3000,
+    compressors="zstd"
+)
+
+# Chave do índice composto usado pela listagem de usuários (ver `create_db_and_collections`)
+USERS_LIST_INDEX = [("is_active", 1), ("name", 1), ("_id", 1), ("age", 1)]
+# Chave do índice usado pela busca por prefixo do nome (parâmetro `q` da listagem)
+NAME_LOWER_INDEX = [("name_lower", 1)]
+
+# Quantidade máxima de atualizações enviadas em cada `bulk_write` do preenchimento de 'name_lower'
+BACKFILL_BATCH_SIZE = 1000
 
 # Acessa o banco de dados chamado "userdb"
 database = client.userdb
@@ -36,15 +54,40 @@ async def create_db_and_collections():
     await users_collection.create_index("email", unique=True, background=True)
     logger.info("Índice único para 'email' garantido.")
 
-async def close_mongo_connection():
-    """Fecha a conexão do cliente MongoDB."""
-    client.close()
-    logger.info("Conexão com o MongoDB fechada.")
+    # Índice composto para a listagem, seguindo a regra ESR (Equality, Sort, Range):
+    # igualdade em 'is_active', ordenação por ('name', '_id') e intervalo em 'age'.
+    await users_collection.create_index(USERS_LIST_INDEX, background=True)
+    # Índice em ('name', '_id') para as listagens sem filtro de 'is_active' (evita ordenação em memória).
+    await users_collection.create_index([("name", 1), ("_id", 1)], background=True)
+    # Índice em 'name_lower' (nome em minúsculas) para a busca por prefixo do parâmetro `q`.
+    await users_collection.create_index(NAME_LOWER_INDEX, background=True)
+    logger.info("Índices para a listagem de usuários garantidos.")
 
-def get_db_collection():
+    await backfill_name_lower(users_collection)
+
+async def backfill_name_lower(collection):
     """
-    Função de dependência para obter a coleção do banco de dados nos endpoints.
-    Embora simples, o uso de uma função de dependência facilita a testabilidade
-    e a manutenção no futuro.
+    Preenche 'name_lower' nos documentos gravados antes da existência do campo.
+    A conversão é feita em Python (`str.lower`), a mesma usada nas escritas da API,
+    pois o `$toLower` do MongoDB só é bem definido para caracteres ASCII.
+    O cursor é consumido em lotes de `BACKFILL_BATCH_SIZE`, mantendo a memória
+    constante independentemente do tamanho da coleção.
     """
-    return users_collection
+    total = 0
+    updates = []
+    async for doc in collection.find({"name_lower": {"$exists": False}}, {"name": 1}):
+        updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"name_lower": doc["name"].lower()}}))
+        if len(updates) == BACKFILL_BATCH_SIZE:
+            await collection.bulk_write(updates, ordered=False)
+            total += len(updates)
+            updates = []
+    if updates:
+        await collection.bulk_write(updates, ordered=False)
+        total += len(updates)
+    if total:
+        logger.info("Campo 'name_lower' preenchido em %d usuários.", total)
+
+async def close_mongo_connection():
+    """Fecha a conexão do cliente MongoDB."""
+    await client.close()
+    logger.info("Conexão com o MongoDB fechada.")
@@ -1,5 +1,6 @@
 # app/main.py
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from database import create_db_and_collections, close_mongo_connection
 from routers.users import router as users_router
@@ -30,6 +31,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Comprime com gzip as respostas maiores que 500 bytes (ex.: páginas da listagem de usuários).
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Inclui o roteador de usuários na aplicação principal
 # Todas as rotas definidas em `users_router` terão o prefixo "/users"
 app.include_router(users_router, prefix="/users", tags=["Users"])
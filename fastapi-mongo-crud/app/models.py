@@ -1,25 +1,7 @@
 # app/models.py
+from dataclasses import dataclass
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
-from bson import ObjectId
-
-class PyObjectId(ObjectId):
-    """
-    Classe personalizada para lidar com a conversão de `ObjectId` do MongoDB.
-    """
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-
-    @classmethod
-    def validate(cls, v, *args, **kwargs):
-        if not ObjectId.is_valid(v):
-            raise ValueError("ID inválido")
-        return ObjectId(v)
-
-    @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema, *args, **kwargs):
-        field_schema.update(type="string")
+from typing import List, Optional
 
 
 class UserBase(BaseModel):
@@ -50,14 +32,49 @@ class UserUpdate(BaseModel):
 class UserResponse(UserBase):
     """
     Modelo para a resposta da API. Inclui o 'id' do banco de dados.
-    O alias `_id` é usado para mapear o campo do MongoDB para o campo `id` do modelo.
+    Usado apenas para documentar as rotas: as respostas são montadas a partir do `UserDTO`.
+    """
+    id: str = Field(..., description="ID do usuário (ObjectId em formato de texto)")
+
+
+@dataclass(slots=True)
+class UserDTO:
+    """
+    Representação interna de um usuário lido do banco.
+    O Pydantic fica restrito à fronteira da API (validação da entrada); os dados vindos do
+    MongoDB já são confiáveis e não precisam passar pelos validadores novamente.
     """
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    name: str
+    email: str
+    age: int
+    is_active: bool
+    id: str
+
+
+class UserCursor(BaseModel):
+    """
+    Cursor para a paginação por intervalo ("seek").
+    Deve ser repassado nos parâmetros `after_name` e `after_id` para obter a próxima página.
+    """
+    after_name: str
+    after_id: str
+
+
+class UserListResponse(BaseModel):
+    """Modelo para a resposta da listagem de usuários."""
+    data: List[UserResponse]
+    total: Optional[int] = Field(None, description="Total de usuários que atendem aos filtros (com `include_total=true`)")
+    next_cursor: Optional[UserCursor] = Field(None, description="Cursor da próxima página (nulo na última)")
+
+
+class UserBulkError(BaseModel):
+    """Erro de um item da criação em lote, identificado pela sua posição na requisição."""
+    index: int = Field(..., description="Posição do usuário na lista enviada")
+    status_code: int = Field(..., description="Código HTTP equivalente ao erro (ex.: 409)")
+    detail: str
+
 
-    class Config:
-        # Permite que o Pydantic funcione com modelos de ORM/ODM (como os do Motor)
-        from_attributes = True
-        # Permite o uso de alias no mapeamento de campos
-        populate_by_name = True
-        # Permite a serialização de tipos como ObjectId para JSON
-        json_encoders = {ObjectId: str}
+class UserBulkResponse(BaseModel):
+    """Modelo para a resposta da criação em lote."""
+    created: List[UserResponse]
+    errors: List[UserBulkError]
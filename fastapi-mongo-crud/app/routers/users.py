@@ -1,13 +1,83 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Response, Query
-from typing import List
-from pymongo.errors import DuplicateKeyError
+import asyncio
+import re
+from fastapi import APIRouter, HTTPException, status, Response, Query, Body
+from typing import Annotated, List
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from bson import ObjectId
-from models import UserCreate, UserUpdate, UserResponse
-from database import get_db_collection
-from motor.motor_asyncio import AsyncIOMotorCollection
+from bson.errors import InvalidId
+from cachetools import TTLCache
+import orjson
+from models import UserCreate, UserUpdate, UserResponse, UserListResponse, UserBulkResponse, UserDTO
+from database import users_collection as db, USERS_LIST_INDEX, NAME_LOWER_INDEX
 
 router = APIRouter()
 
+# Códigos HTTP usados dentro das rotas, resolvidos uma única vez na importação
+# em vez de buscar o atributo em `status` a cada requisição.
+CREATED = status.HTTP_201_CREATED
+NO_CONTENT = status.HTTP_204_NO_CONTENT
+BAD_REQUEST = status.HTTP_400_BAD_REQUEST
+NOT_FOUND = status.HTTP_404_NOT_FOUND
+CONFLICT = status.HTTP_409_CONFLICT
+
+# Número máximo de usuários aceitos em uma única requisição de criação em lote
+MAX_BULK_USERS = 1000
+
+# Código de erro do MongoDB para violação de índice único
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# Cache em memória das leituras por ID, invalidado nas escritas deste processo.
+# O TTL limita por quanto tempo outros workers podem servir um dado desatualizado.
+_user_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Leituras por ID em andamento: [quantidade de leituras, contador de invalidações].
+# Uma leitura só grava no cache se o contador não mudou durante o `find_one`; assim, um
+# documento lido antes de um PUT/DELETE não volta ao cache depois da invalidação.
+# A entrada é removida quando a última leitura do ID termina, então o dict não cresce.
+_pending_reads = {}
+
+# Campos retornados pelas consultas: apenas o que o `UserDTO` expõe (o `_id` vem por padrão).
+USER_PROJECTION = {"name": 1, "email": 1, "age": 1, "is_active": 1}
+
+def to_user(doc: dict) -> UserDTO:
+    """
+    Converte um documento do MongoDB no `UserDTO` interno, sem passar pelo Pydantic.
+    Os dados vêm do nosso próprio banco (já validados na entrada).
+    """
+    return UserDTO(
+        name=doc["name"],
+        email=doc["email"],
+        age=doc["age"],
+        is_active=doc["is_active"],
+        id=str(doc["_id"])
+    )
+
+def json_response(content, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serializa a resposta com `orjson`, que converte os `UserDTO` diretamente.
+    Ao retornar um `Response`, o FastAPI não revalida o conteúdo com o `response_model`,
+    que continua declarado nas rotas apenas para documentar o formato na OpenAPI.
+    """
+    return Response(content=orjson.dumps(content), status_code=status_code, media_type="application/json")
+
+def invalidate_cached_user(oid: ObjectId) -> None:
+    """Remove o usuário do cache e descarta o resultado das leituras em andamento."""
+    _user_cache.pop(oid, None)
+    pending = _pending_reads.get(oid)
+    if pending is not None:
+        pending[1] += 1
+
+def parse_oid(id: str, detail: str = "ID inválido") -> ObjectId:
+    """
+    Converte o `id` recebido em `ObjectId`, levantando exceção 400 com `detail` se for inválido.
+    Uma única conversão substitui o par `ObjectId.is_valid` + `ObjectId(id)`.
+    """
+    try:
+        return ObjectId(id)
+    except InvalidId:
+        raise HTTPException(status_code=BAD_REQUEST, detail=detail)
+
 @router.post(
     "/",
     response_model=UserResponse,
@@ -15,49 +85,98 @@ router = APIRouter()
     summary="Cria um novo usuário",
     description="Cria um novo usuário no banco de dados. O e-mail deve ser único."
 )
-async def create_user(
-    user: UserCreate, 
-    db: AsyncIOMotorCollection = Depends(get_db_collection)
-):
+async def create_user(user: UserCreate):
     """
     Cria um novo usuário.
     - **user**: Dados do usuário a ser criado.
     - **Retorna**: O usuário criado com seu ID.
     - **Levanta exceção 409** se o e-mail já existir.
     """
-    user_dict = user.model_dump()
+    # Os modelos são planos e já validados: copiar `__dict__` evita o custo do `model_dump()`
+    user_dict = dict(user.__dict__)
+    user_dict["name_lower"] = user.name.lower()
     try:
         result = await db.insert_one(user_dict)
-        # Busca o documento recém-criado para retornar ao cliente
-        created_user = await db.find_one({"_id": result.inserted_id})
-        return created_user
+        # Monta a resposta a partir dos dados já validados, sem reler o documento
+        user_dict["_id"] = result.inserted_id
+        return json_response(to_user(user_dict), CREATED)
     except DuplicateKeyError:
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
+            status_code=CONFLICT,
             detail=f"O e-mail '{user.email}' já está em uso."
         )
 
+@router.post(
+    "/bulk",
+    response_model=UserBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Cria vários usuários",
+    description=(
+        f"Cria uma lista de até {MAX_BULK_USERS} usuários com um único `insert_many`. "
+        "E-mails duplicados são reportados por item."
+    )
+)
+async def create_users_bulk(users: Annotated[List[UserCreate], Body(max_length=MAX_BULK_USERS)]):
+    """
+    Cria vários usuários em uma única ida ao banco.
+    - **users**: Lista de usuários a serem criados.
+    - **Retorna**: Os usuários criados e, para cada item rejeitado, sua posição e o motivo.
+    - **Levanta exceção 400** se a lista estiver vazia.
+    - **Levanta exceção 422** se a lista tiver mais de `MAX_BULK_USERS` usuários.
+    """
+    if not users:
+        raise HTTPException(status_code=BAD_REQUEST, detail="Nenhum usuário para criar foi fornecido.")
+
+    user_dicts = [dict(user.__dict__, name_lower=user.name.lower()) for user in users]
+    failed = {}
+    try:
+        # `ordered=False` faz o MongoDB continuar inserindo os demais itens após um erro
+        await db.insert_many(user_dicts, ordered=False)
+    except BulkWriteError as exc:
+        for write_error in exc.details["writeErrors"]:
+            if write_error["code"] != DUPLICATE_KEY_ERROR_CODE:
+                raise
+            index = write_error["index"]
+            failed[index] = {
+                "index": index,
+                "status_code": CONFLICT,
+                "detail": f"O e-mail '{users[index].email}' já está em uso."
+            }
+
+    # O `insert_many` preenche o `_id` de cada dicionário enviado
+    created = [to_user(user_dict) for i, user_dict in enumerate(user_dicts) if i not in failed]
+    return json_response({"created": created, "errors": list(failed.values())}, CREATED)
+
 @router.get(
     "/",
-    response_model=List[UserResponse],
+    response_model=UserListResponse,
     summary="Lista todos os usuários",
-    description="Retorna uma lista de usuários com suporte a filtros e paginação."
+    description="Retorna uma lista de usuários com suporte a filtros e paginação por cursor."
 )
 async def get_users(
-    q: str = Query(None, description="Busca textual pelo nome do usuário (case-insensitive)"),
+    q: str = Query(None, max_length=80, description="Busca pelo início do nome do usuário (case-insensitive)"),
     min_age: int = Query(None, ge=0, description="Filtro para idade mínima"),
     max_age: int = Query(None, ge=0, description="Filtro para idade máxima"),
     is_active: bool = Query(None, description="Filtro por status de usuário ativo"),
-    page: int = Query(1, ge=1, description="Número da página"),
+    after_name: str = Query(None, description="Cursor: nome do último usuário da página anterior"),
+    after_id: str = Query(None, description="Cursor: ID do último usuário da página anterior"),
     limit: int = Query(10, ge=1, le=100, description="Número de itens por página"),
-    db: AsyncIOMotorCollection = Depends(get_db_collection)
+    include_total: bool = Query(False, description="Inclui o total de usuários que atendem aos filtros")
 ):
     """
-    Lista usuários com filtros e paginação.
+    Lista usuários com filtros e paginação por intervalo ("seek").
+    - A primeira página é obtida sem cursor; as seguintes usam o `next_cursor` da resposta.
+    - **Levanta exceção 400** se o cursor estiver incompleto ou com ID inválido.
     """
     filters = {}
     if q:
-        filters["name"] = {"$regex": q, "$options": "i"}
+        # A busca é feita em 'name_lower' (o nome em minúsculas, gravado junto com 'name').
+        # Uma regex ancorada (`^`) e sem a opção "i" permite que o MongoDB limite a leitura do
+        # índice de 'name_lower' ao intervalo do prefixo; com "i", todo o índice seria percorrido.
+        # `re.escape` trata `q` como texto literal, impedindo que a entrada do usuário injete
+        # padrões com backtracking catastrófico (ReDoS).
+        # O `max_length` de `q` acompanha o do campo `name`, já que termos maiores nunca casariam.
+        filters["name_lower"] = {"$regex": f"^{re.escape(q.lower())}"}
     if min_age is not None and max_age is not None:
         filters["age"] = {"$gte": min_age, "$lte": max_age}
     elif min_age is not None:
@@ -66,11 +185,45 @@ async def get_users(
         filters["age"] = {"$lte": max_age}
     if is_active is not None:
         filters["is_active"] = is_active
-    
-    skip = (page - 1) * limit
-    cursor = db.find(filters).sort("name", 1).skip(skip).limit(limit)
-    users = await cursor.to_list(length=limit)
-    return users
+
+    # Em vez de `skip`, que obriga o MongoDB a percorrer e descartar os documentos das
+    # páginas anteriores, continua a partir do último (name, _id) visto.
+    if (after_name is None) != (after_id is None):
+        raise HTTPException(status_code=BAD_REQUEST, detail="Informe 'after_name' e 'after_id' juntos.")
+    page_filters = filters
+    if after_id is not None:
+        after_oid = parse_oid(after_id, "Cursor inválido")
+        page_filters = {**filters, "$or": [
+            {"name": {"$gt": after_name}},
+            {"name": after_name, "_id": {"$gt": after_oid}}
+        ]}
+
+    cursor = db.find(page_filters, USER_PROJECTION).sort([("name", 1), ("_id", 1)]).limit(limit)
+    if include_total:
+        # A contagem é uma consulta separada, executada em paralelo com a da página.
+        # Sem filtros, `estimated_document_count` usa os metadados da coleção (O(1)).
+        # Com filtros, o `hint` depende de quais foram informados: o índice da listagem só
+        # é útil se 'is_active' (seu primeiro campo) estiver no filtro; forçá-lo sem ele faria
+        # o MongoDB percorrer o índice inteiro. Com `q`, o índice de 'name_lower' delimita o
+        # prefixo e tem precedência. Só com idade, nenhum índice ajuda e o planner decide.
+        if "name_lower" in filters:
+            count = db.count_documents(filters, hint=NAME_LOWER_INDEX)
+        elif "is_active" in filters:
+            count = db.count_documents(filters, hint=USERS_LIST_INDEX)
+        elif filters:
+            count = db.count_documents(filters)
+        else:
+            count = db.estimated_document_count()
+        docs, total = await asyncio.gather(cursor.to_list(length=limit), count)
+    else:
+        docs, total = await cursor.to_list(length=limit), None
+    users = [to_user(user) for user in docs]
+
+    next_cursor = None
+    if len(users) == limit:
+        last = users[-1]
+        next_cursor = {"after_name": last.name, "after_id": last.id}
+    return json_response({"data": users, "total": total, "next_cursor": next_cursor})
 
 @router.get(
     "/{id}",
@@ -78,10 +231,7 @@ async def get_users(
     summary="Busca um usuário pelo ID",
     description="Retorna os dados de um usuário específico."
 )
-async def get_user_by_id(
-    id: str, 
-    db: AsyncIOMotorCollection = Depends(get_db_collection)
-):
+async def get_user_by_id(id: str):
     """
     Obtém um único usuário pelo seu ID.
     - **id**: ID do usuário (deve ser um ObjectId válido).
@@ -89,13 +239,27 @@ async def get_user_by_id(
     - **Levanta exceção 400** se o ID for inválido.
     - **Levanta exceção 404** se o usuário não for encontrado.
     """
-    if not ObjectId.is_valid(id):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ID inválido")
-    
-    user = await db.find_one({"_id": ObjectId(id)})
+    oid = parse_oid(id)
+    cached = _user_cache.get(oid)
+    if cached is not None:
+        return json_response(cached)
+
+    pending = _pending_reads.setdefault(oid, [0, 0])
+    pending[0] += 1
+    version = pending[1]
+    try:
+        user = await db.find_one({"_id": oid}, USER_PROJECTION)
+    finally:
+        pending[0] -= 1
+        if pending[0] == 0:
+            del _pending_reads[oid]
+
     if user:
-        return user
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Usuário com ID '{id}' não encontrado")
+        user_dto = to_user(user)
+        if pending[1] == version:
+            _user_cache[oid] = user_dto
+        return json_response(user_dto)
+    raise HTTPException(status_code=NOT_FOUND, detail=f"Usuário com ID '{id}' não encontrado")
 
 @router.put(
     "/{id}",
@@ -103,42 +267,49 @@ async def get_user_by_id(
     summary="Atualiza um usuário",
     description="Atualiza os dados de um usuário existente."
 )
-async def update_user(
-    id: str,
-    user_update: UserUpdate,
-    db: AsyncIOMotorCollection = Depends(get_db_collection)
-):
+async def update_user(id: str, user_update: UserUpdate):
     """
     Atualiza um usuário.
     - **id**: ID do usuário a ser atualizado.
     - **user_update**: Dados a serem atualizados (campos opcionais).
     - **Retorna**: O usuário com os dados atualizados.
+    - **Levanta exceção 400** se nenhum campo for enviado ou se algum campo for enviado como `null`.
     - **Levanta exceção 404** se o usuário não for encontrado.
     - **Levanta exceção 409** se o novo e-mail já pertencer a outro usuário.
     """
-    if not ObjectId.is_valid(id):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ID inválido")
+    oid = parse_oid(id)
 
-    # `model_dump(exclude_unset=True)` cria um dict apenas com os campos que foram enviados
-    update_data = user_update.model_dump(exclude_unset=True)
+    # Equivale a `model_dump(exclude_unset=True)`: apenas os campos que foram enviados.
+    # Se o modelo passar a ter campos aninhados, volte a usar `model_dump`.
+    update_data = {k: v for k, v in user_update.__dict__.items() if k in user_update.model_fields_set}
     if not update_data:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nenhum dado para atualizar foi fornecido.")
+        raise HTTPException(status_code=BAD_REQUEST, detail="Nenhum dado para atualizar foi fornecido.")
+    # Os campos são opcionais apenas para permitir atualizações parciais: nenhum deles pode
+    # ser apagado. Um `name` nulo, por exemplo, quebraria o cursor da listagem (`after_name`).
+    null_fields = [k for k, v in update_data.items() if v is None]
+    if null_fields:
+        raise HTTPException(status_code=BAD_REQUEST, detail=f"Os campos não podem ser nulos: {', '.join(null_fields)}.")
+    if "name" in update_data:
+        update_data["name_lower"] = update_data["name"].lower()
 
-    # Verifica se o e-mail está sendo alterado para um que já existe
-    if "email" in update_data:
-        if await db.find_one({"email": update_data["email"], "_id": {"$ne": ObjectId(id)}}):
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"O e-mail '{update_data['email']}' já está em uso.")
+    # `find_one_and_update` aplica a atualização e devolve o documento atualizado em uma
+    # única ida ao banco. A unicidade do e-mail fica a cargo do índice único em 'email':
+    # sem uma consulta prévia, não há janela entre verificar e gravar para escritas concorrentes.
+    try:
+        updated_user = await db.find_one_and_update(
+            {"_id": oid},
+            {"$set": update_data},
+            projection=USER_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=CONFLICT, detail=f"O e-mail '{update_data['email']}' já está em uso.")
 
-    result = await db.update_one(
-        {"_id": ObjectId(id)},
-        {"$set": update_data}
-    )
+    invalidate_cached_user(oid)
+    if updated_user is None:
+        raise HTTPException(status_code=NOT_FOUND, detail=f"Usuário com ID '{id}' não encontrado")
 
-    if result.matched_count == 0:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Usuário com ID '{id}' não encontrado")
-    
-    updated_user = await db.find_one({"_id": ObjectId(id)})
-    return updated_user
+    return json_response(to_user(updated_user))
 
 @router.delete(
     "/{id}",
@@ -146,22 +317,19 @@ async def update_user(
     summary="Deleta um usuário",
     description="Remove um usuário do banco de dados."
 )
-async def delete_user(
-    id: str, 
-    db: AsyncIOMotorCollection = Depends(get_db_collection)
-):
+async def delete_user(id: str):
     """
     Deleta um usuário.
     - **id**: ID do usuário a ser deletado.
     - **Retorna**: Status 204 se a deleção for bem-sucedida.
     - **Levanta exceção 404** se o usuário não for encontrado.
     """
-    if not ObjectId.is_valid(id):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ID inválido")
+    oid = parse_oid(id)
 
-    result = await db.delete_one({"_id": ObjectId(id)})
+    result = await db.delete_one({"_id": oid})
+    invalidate_cached_user(oid)
     if result.deleted_count == 0:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Usuário com ID '{id}' não encontrado")
+        raise HTTPException(status_code=NOT_FOUND, detail=f"Usuário com ID '{id}' não encontrado")
     
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return Response(status_code=NO_CONTENT)
 
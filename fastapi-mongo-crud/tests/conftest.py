@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+import mongomock
+import pytest
+
+# Os módulos da aplicação são importados a partir da pasta `app` (como no contêiner)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from fastapi.testclient import TestClient
+
+from main import app
+from routers import users
+
+
+class AsyncCursor:
+    """Adapta um cursor do `mongomock` à interface assíncrona do cursor do PyMongo."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, limit):
+        self._cursor = self._cursor.limit(limit)
+        return self
+
+    async def to_list(self, length=None):
+        return list(self._cursor)[:length]
+
+    async def __aiter__(self):
+        for doc in self._cursor:
+            yield doc
+
+
+class AsyncCollection:
+    """
+    Adapta uma coleção do `mongomock` à interface da `AsyncCollection` do PyMongo:
+    `find` devolve um cursor assíncrono e os demais métodos viram corrotinas.
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+@pytest.fixture
+def mongo_collection(monkeypatch):
+    """Coleção em memória, com o índice único de 'email', no lugar da coleção real."""
+    collection = mongomock.MongoClient().userdb.users
+    collection.create_index("email", unique=True)
+    fake = AsyncCollection(collection)
+    monkeypatch.setattr(users, "db", fake)
+    users._user_cache.clear()
+    yield fake
+    users._user_cache.clear()
+
+
+@pytest.fixture
+def client(mongo_collection):
+    """Cliente HTTP da aplicação. Sem o bloco `with`, o lifespan (conexão ao MongoDB) não é executado."""
+    return TestClient(app)
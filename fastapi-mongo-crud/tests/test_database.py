@@ -0,0 +1,35 @@
+import asyncio
+
+from bson import ObjectId
+
+import database
+
+
+class BackfillCollection:
+    """Coleção falsa que devolve `size` documentos sem 'name_lower' e registra cada `bulk_write`."""
+
+    def __init__(self, size):
+        self.docs = [{"_id": ObjectId(), "name": f"Usuário {i}"} for i in range(size)]
+        self.batches = []
+
+    async def find(self, filter, projection=None):
+        for doc in self.docs:
+            yield doc
+
+    async def bulk_write(self, requests, ordered=True):
+        self.batches.append(requests)
+
+
+def test_backfill_writes_in_fixed_size_batches(monkeypatch):
+    monkeypatch.setattr(database, "BACKFILL_BATCH_SIZE", 2)
+    collection = BackfillCollection(5)
+    asyncio.run(database.backfill_name_lower(collection))
+    assert [len(batch) for batch in collection.batches] == [2, 2, 1]
+    first = collection.batches[0][0]
+    assert first._doc == {"$set": {"name_lower": "usuário 0"}}
+
+
+def test_backfill_skips_bulk_write_when_nothing_to_update():
+    collection = BackfillCollection(0)
+    asyncio.run(database.backfill_name_lower(collection))
+    assert collection.batches == []
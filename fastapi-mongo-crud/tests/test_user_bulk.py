@@ -0,0 +1,67 @@
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from routers import users
+
+
+def payload(*emails):
+    return [{"name": f"Usuário {i}", "email": email, "age": 20} for i, email in enumerate(emails)]
+
+
+class FailingInsertCollection:
+    """Coleção falsa cujo `insert_many` preenche os `_id` e falha com os `writeErrors` informados."""
+
+    def __init__(self, write_errors):
+        self.write_errors = write_errors
+
+    async def insert_many(self, documents, ordered=True):
+        for doc in documents:
+            doc["_id"] = ObjectId()
+        raise BulkWriteError({"writeErrors": self.write_errors, "nInserted": len(documents) - len(self.write_errors)})
+
+
+def duplicate_key_error(index):
+    return {"index": index, "code": users.DUPLICATE_KEY_ERROR_CODE, "errmsg": "E11000 duplicate key error"}
+
+
+def test_bulk_reports_duplicates_by_index(client, monkeypatch):
+    monkeypatch.setattr(users, "db", FailingInsertCollection([duplicate_key_error(1), duplicate_key_error(3)]))
+    response = client.post("/users/bulk", json=payload("a@example.com", "b@example.com", "c@example.com", "d@example.com", "e@example.com"))
+    assert response.status_code == 201
+    body = response.json()
+    assert [user["email"] for user in body["created"]] == ["a@example.com", "c@example.com", "e@example.com"]
+    assert all(ObjectId.is_valid(user["id"]) for user in body["created"])
+    assert body["errors"] == [
+        {"index": 1, "status_code": 409, "detail": "O e-mail 'b@example.com' já está em uso."},
+        {"index": 3, "status_code": 409, "detail": "O e-mail 'd@example.com' já está em uso."},
+    ]
+
+
+def test_bulk_propagates_other_write_errors(client, monkeypatch):
+    validation_error = {"index": 2, "code": 121, "errmsg": "Document failed validation"}
+    monkeypatch.setattr(users, "db", FailingInsertCollection([duplicate_key_error(0), validation_error]))
+    with pytest.raises(BulkWriteError):
+        client.post("/users/bulk", json=payload("a@example.com", "b@example.com", "c@example.com"))
+
+
+def test_bulk_rejects_duplicates_within_batch_and_existing_emails(client, mongo_collection):
+    client.post("/users/", json={"name": "Maria", "email": "maria@example.com", "age": 30})
+    response = client.post("/users/bulk", json=payload("a@example.com", "maria@example.com", "b@example.com", "a@example.com"))
+    assert response.status_code == 201
+    body = response.json()
+    assert [user["email"] for user in body["created"]] == ["a@example.com", "b@example.com"]
+    assert [error["index"] for error in body["errors"]] == [1, 3]
+    assert mongo_collection._collection.count_documents({}) == 3
+    stored = mongo_collection._collection.find_one({"email": "b@example.com"})
+    assert str(stored["_id"]) == body["created"][1]["id"]
+    assert stored["name_lower"] == "usuário 2"
+
+
+def test_bulk_rejects_empty_list(client):
+    assert client.post("/users/bulk", json=[]).status_code == 400
+
+
+def test_bulk_rejects_more_than_max_users(client):
+    emails = [f"u{i}@example.com" for i in range(users.MAX_BULK_USERS + 1)]
+    assert client.post("/users/bulk", json=payload(*emails)).status_code == 422
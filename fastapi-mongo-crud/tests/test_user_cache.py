@@ -0,0 +1,94 @@
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from models import UserUpdate
+from routers import users
+
+USER_ID = ObjectId()
+
+
+class SlowCollection:
+    """
+    Coleção falsa com um único usuário. Quando `release` está definido, o `find_one`
+    lê o documento na hora da chamada, mas só retorna depois que o evento é liberado,
+    simulando uma consulta lenta que se cruza com uma escrita.
+    """
+
+    def __init__(self):
+        self.doc = {"_id": USER_ID, "name": "Maria", "email": "maria@example.com", "age": 20, "is_active": True}
+        self.release = None
+
+    async def find_one(self, filter, projection=None):
+        snapshot = dict(self.doc) if self.doc else None
+        if self.release is not None:
+            await self.release.wait()
+        return snapshot
+
+    async def find_one_and_update(self, filter, update, projection=None, return_document=None):
+        self.doc.update(update["$set"])
+        return dict(self.doc)
+
+    async def delete_one(self, filter):
+        deleted_count = 1 if self.doc else 0
+        self.doc = None
+        return SimpleNamespace(deleted_count=deleted_count)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    fake = SlowCollection()
+    monkeypatch.setattr(users, "db", fake)
+    users._user_cache.clear()
+    yield fake
+    users._user_cache.clear()
+
+
+async def read_during(collection, write):
+    """Inicia um GET, executa `write` enquanto o `find_one` está pendente e conclui o GET."""
+    collection.release = asyncio.Event()
+    slow_read = asyncio.create_task(users.get_user_by_id(str(USER_ID)))
+    await asyncio.sleep(0)
+    await write()
+    collection.release.set()
+    response = await slow_read
+    collection.release = None
+    return orjson.loads(response.body)
+
+
+def test_update_during_read_does_not_cache_stale_user(collection):
+    async def scenario():
+        stale = await read_during(collection, lambda: users.update_user(str(USER_ID), UserUpdate(age=99)))
+        assert stale["age"] == 20
+
+        fresh = await users.get_user_by_id(str(USER_ID))
+        assert orjson.loads(fresh.body)["age"] == 99
+
+    asyncio.run(scenario())
+    assert users._pending_reads == {}
+
+
+def test_delete_during_read_does_not_cache_deleted_user(collection):
+    async def scenario():
+        await read_during(collection, lambda: users.delete_user(str(USER_ID)))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await users.get_user_by_id(str(USER_ID))
+        assert exc_info.value.status_code == 404
+
+    asyncio.run(scenario())
+    assert users._pending_reads == {}
+
+
+def test_read_without_concurrent_write_is_cached(collection):
+    async def scenario():
+        await users.get_user_by_id(str(USER_ID))
+        collection.doc = None
+        cached = await users.get_user_by_id(str(USER_ID))
+        assert orjson.loads(cached.body)["age"] == 20
+
+    asyncio.run(scenario())
@@ -0,0 +1,88 @@
+import pytest
+
+from database import NAME_LOWER_INDEX, USERS_LIST_INDEX
+
+NAMES = ["Bia", "Ana", "Bia", "Caio", "Bia", "Davi", "Bia", "Eva"]
+
+
+@pytest.fixture
+def user_ids(client):
+    ids = []
+    for i, name in enumerate(NAMES):
+        response = client.post("/users/", json={"name": name, "email": f"u{i}@example.com", "age": 20 + i})
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_cursor_pagination_visits_each_user_once(client, user_ids, limit):
+    seen, cursor = [], {}
+    while True:
+        body = client.get("/users/", params={"limit": limit, **cursor}).json()
+        seen += [(user["name"], user["id"]) for user in body["data"]]
+        if body["next_cursor"] is None:
+            break
+        cursor = body["next_cursor"]
+    assert sorted(id for _, id in seen) == sorted(user_ids)
+    assert seen == sorted(seen)
+
+
+def test_cursor_continues_after_duplicate_name(client, user_ids):
+    first = client.get("/users/", params={"limit": 2}).json()
+    assert [user["name"] for user in first["data"]] == ["Ana", "Bia"]
+    assert first["next_cursor"]["after_name"] == "Bia"
+    second = client.get("/users/", params={"limit": 3, **first["next_cursor"]}).json()
+    assert [user["name"] for user in second["data"]] == ["Bia", "Bia", "Bia"]
+    assert first["data"][1]["id"] not in [user["id"] for user in second["data"]]
+
+
+def test_last_page_has_no_cursor(client, user_ids):
+    body = client.get("/users/", params={"limit": len(NAMES) + 1, "include_total": True}).json()
+    assert body["next_cursor"] is None
+    assert body["total"] == len(NAMES)
+
+
+@pytest.mark.parametrize("params", [{"after_name": "Bia"}, {"after_id": "0" * 24}])
+def test_incomplete_cursor_is_rejected(client, params):
+    response = client.get("/users/", params=params)
+    assert response.status_code == 400
+
+
+def test_invalid_cursor_id_is_rejected(client):
+    response = client.get("/users/", params={"after_name": "Bia", "after_id": "abc"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
+
+
+@pytest.fixture
+def count_calls(mongo_collection):
+    """Registra os argumentos de cada `count_documents` feito pela listagem."""
+    calls = []
+    count_documents = mongo_collection.count_documents
+
+    async def recording_count_documents(filter, **kwargs):
+        calls.append((filter, kwargs))
+        return await count_documents(filter, **kwargs)
+
+    mongo_collection.count_documents = recording_count_documents
+    return calls
+
+
+@pytest.mark.parametrize("params, hint", [
+    ({"q": "bi"}, NAME_LOWER_INDEX),
+    ({"q": "bi", "is_active": True}, NAME_LOWER_INDEX),
+    ({"is_active": True, "min_age": 21}, USERS_LIST_INDEX),
+    ({"min_age": 21}, None),
+])
+def test_total_hint_depends_on_filters(client, user_ids, count_calls, params, hint):
+    body = client.get("/users/", params={"include_total": True, **params}).json()
+    assert body["total"] == len(body["data"])
+    [(_, kwargs)] = count_calls
+    assert kwargs.get("hint") == hint
+
+
+def test_total_without_filters_uses_estimated_count(client, user_ids, count_calls):
+    body = client.get("/users/", params={"include_total": True}).json()
+    assert body["total"] == len(NAMES)
+    assert count_calls == []
@@ -0,0 +1,35 @@
+import pytest
+
+
+@pytest.fixture
+def people(client):
+    for i, name in enumerate(["Ana", "ana Clara", "Mariana", "Anabela", "Bruno", "A.na"]):
+        response = client.post("/users/", json={"name": name, "email": f"u{i}@example.com", "age": 20})
+        assert response.status_code == 201
+
+
+def names(client, **params):
+    response = client.get("/users/", params=params)
+    assert response.status_code == 200
+    return [user["name"] for user in response.json()["data"]]
+
+
+def test_search_matches_prefix_ignoring_case(client, people):
+    assert names(client, q="ANA") == ["Ana", "Anabela", "ana Clara"]
+
+
+def test_search_only_matches_start_of_name(client, people):
+    assert "Mariana" not in names(client, q="ana")
+    assert names(client, q="bru") == ["Bruno"]
+
+
+def test_search_treats_regex_characters_literally(client, people):
+    assert names(client, q="a.") == ["A.na"]
+    assert names(client, q="(") == []
+
+
+def test_search_filters_on_name_lower(client, mongo_collection):
+    client.post("/users/", json={"name": "Élodie", "email": "elodie@example.com", "age": 30})
+    stored = mongo_collection._collection.find_one({"email": "elodie@example.com"})
+    assert stored["name_lower"] == "élodie"
+    assert names(client, q="ÉLO") == ["Élodie"]
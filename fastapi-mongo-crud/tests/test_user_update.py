@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def user_id(client):
+    response = client.post("/users/", json={"name": "Maria", "email": "maria@example.com", "age": 20})
+    return response.json()["id"]
+
+
+@pytest.mark.parametrize("field", ["name", "email", "age", "is_active"])
+def test_update_rejects_null_fields(client, user_id, field):
+    response = client.put(f"/users/{user_id}", json={field: None})
+    assert response.status_code == 400
+    assert field in response.json()["detail"]
+    assert client.get(f"/users/{user_id}").json()["name"] == "Maria"
+
+
+def test_update_name_refreshes_name_lower(client, mongo_collection, user_id):
+    response = client.put(f"/users/{user_id}", json={"name": "Joana"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Joana"
+    stored = mongo_collection._collection.find_one({"email": "maria@example.com"})
+    assert stored["name_lower"] == "joana"
+
+
+def test_update_without_fields_is_rejected(client, user_id):
+    assert client.put(f"/users/{user_id}", json={}).status_code == 400
+
+
+def test_update_rejects_invalid_id(client):
+    response = client.put("/users/abc", json={"name": "Joana"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "ID inválido"